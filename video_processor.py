@@ -3,30 +3,176 @@ from tkinter import filedialog
 from tkinter import ttk
 from tkinter import scrolledtext
 from tkinter import messagebox
-from datetime import datetime
+from tkinter import font as tkfont
+import asyncio
+import atexit
+import collections
 import json
 import configparser
+import ctypes
 import os
+import queue
+import select
 import subprocess
+import sys
 import threading
-import queue
 import time
 import logging
+import logging.handlers
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import psutil
+try:  # Optional, reads MP4/WMV durations without spawning FFPROBE
+  import mutagen
+except ImportError:
+  mutagen = None
 
 # Default values for the application
 DFLT_FFMPEG_PATH = "d:/PF/_Tools/ffmpeg/bin/ffmpeg.exe"  # Change this if your ffmpeg path is different.
 DFLT_SRC_DIR = ""
 DFLT_DST_DIR = ""
 DFLT_TEMPO = 1.0
+MIN_TEMPO, MAX_TEMPO = 0.0, 2.0  # Valid tempo range: MIN_TEMPO < tempo <= MAX_TEMPO
 DFLT_N_THREADS = 4
 DFLT_N_THREADS_MAX = 16
+DFLT_FFMPEG_THREADS = 0  # Threads per FFMPEG process; 0 - auto (CPU cores / number of threads)
 DFLT_CONFIG_FILE = "video_processor_config.ini"
 DFLT_LOG_FILE = "video_processor.log"
-VID_EXT = ('.mp4', '.mkv', 'avi', '.webm', '.flv', '.wmv')
+LOG_BUFFER_CAPACITY = 256  # Log records buffered in memory, before writing them to the log file (errors are written at once)
+DFLT_METADATA_CACHE_FILE = "video_processor_metadata_cache.json"  # Durations cache, reused between runs
+DFLT_MANIFEST_FILE = ".video_processor_manifest.json"  # Up-to-date outputs manifest, kept in destination folder
+DFLT_SKIP_UP_TO_DATE = 0  # 1 - skip files, whose output is up-to-date (per manifest), even when overwriting
+VID_EXT = frozenset({'.mp4', '.mkv', '.avi', '.webm', '.flv', '.wmv'})  # Lowercase video file extensions
+MUTAGEN_EXT = frozenset({'.mp4', '.wmv'})  # Extensions, whose duration is read by mutagen (if installed)
 DFLT_OVERWRITE_OPTION = "Skip existing files"  # Skip by default
-GUI_TIMEOUT = 0.3 # in seconds
 UPDATE_STATUS_TIMEOUT = 1 # in seconds
+GUI_UPDATE_INTERVAL = 33 # in milliseconds, period of applying pending status and progress bar updates (~30 Hz)
+MAX_STATUS_MESSAGES_PER_UPDATE = 256  # Limits status text work per GUI update, the rest is shown next time
+# Don't allocate a console window for each FFMPEG/FFPROBE process on Windows
+POPEN_CREATIONFLAGS = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+OUT_TIME_MS_KEY = b"out_time_ms"  # FFMPEG "-progress" key (key=value lines), matched against raw (undecoded) bytes
+# Keys still handled by the (read-only) status text: navigation, selection and copy
+STATUS_TEXT_NAV_KEYS = frozenset({"Up", "Down", "Left", "Right", "Prior", "Next", "Home", "End",
+                                  "Shift_L", "Shift_R", "Control_L", "Control_R"})
+STATUS_TEXT_CTRL_KEYS = frozenset({"c", "C", "a", "A", "slash", "Home", "End", "Insert"})
+
+
+#############################################################################
+def wait_processes(pids, timeout):
+  """Waits for processes to exit in parallel, returns pids of the ones still running after timeout (seconds)."""
+  deadline = time.monotonic() + timeout
+  if hasattr(os, "pidfd_open") and hasattr(select, "poll"):  # Linux: pidfd becomes readable on process exit
+    poller = select.poll()
+    pidfds = {}
+    try:
+      for pid in pids:
+        try:
+          pidfd = os.pidfd_open(pid)
+        except OSError:  # Already exited and reaped
+          continue
+        pidfds[pidfd] = pid
+        poller.register(pidfd, select.POLLIN)
+      while pidfds and (remaining := deadline - time.monotonic()) > 0:
+        for pidfd, _ in poller.poll(remaining * 1000):
+          poller.unregister(pidfd)
+          os.close(pidfd)
+          del pidfds[pidfd]  # Exited (reaped by the asyncio child watcher)
+      return list(pidfds.values())
+    finally:
+      for pidfd in pidfds:
+        os.close(pidfd)
+  elif sys.platform == "win32":  # Windows: wait for all process handles at once
+    kernel32 = ctypes.WinDLL("kernel32")
+    kernel32.OpenProcess.restype = ctypes.c_void_p
+    handles = {}
+    try:
+      for pid in pids:
+        handle = kernel32.OpenProcess(0x00100000, False, pid)  # SYNCHRONIZE
+        if handle:
+          handles[handle] = pid
+      if handles:  # At most 64 handles, always less than DFLT_N_THREADS_MAX
+        handles_arr = (ctypes.c_void_p * len(handles))(*handles)
+        kernel32.WaitForMultipleObjects(len(handles), handles_arr, True, int(timeout * 1000))
+      # WAIT_OBJECT_0 (0) means the process has exited
+      return [pid for handle, pid in handles.items() if kernel32.WaitForSingleObject(ctypes.c_void_p(handle), 0) != 0]
+    finally:
+      for handle in handles:
+        kernel32.CloseHandle(ctypes.c_void_p(handle))
+  else:  # Fallback: psutil waits for all processes, sharing one timeout
+    processes = []
+    for pid in pids:
+      try:
+        processes.append(psutil.Process(pid))
+      except psutil.NoSuchProcess:
+        pass
+    _, alive = psutil.wait_procs(processes, timeout=timeout)
+    return [p.pid for p in alive]
+
+
+#############################################################################
+def get_ffprobe_path(ffmpeg_path):
+  """Returns FFPROBE path, in the same folder and with the same extension (if any) as FFMPEG."""
+  ffmpeg_dir, ffmpeg_name = os.path.split(ffmpeg_path)
+  return os.path.join(ffmpeg_dir, "ffprobe" + os.path.splitext(ffmpeg_name)[1])
+
+
+#############################################################################
+def ffmpeg_threads_per_process(n_processes):
+  """Returns threads per FFMPEG process, sharing CPU cores between n_processes concurrent processes."""
+  return max(1, (os.cpu_count() or n_processes) // max(1, n_processes))
+
+
+#############################################################################
+def iter_video_files(root):
+  """Yields (os.DirEntry, relative path) of video files under root, DirEntry stat() results are reused (cached)."""
+  stack = [(root, "")]  # (directory, its path relative to root)
+  while stack:
+    dir_path, rel_dir = stack.pop()
+    try:
+      with os.scandir(dir_path) as it:
+        for entry in it:
+          # Relative path is built along the walk (cheaper than os.path.relpath per file)
+          rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+          if entry.is_dir(follow_symlinks=False):
+            stack.append((entry.path, rel_path))
+          elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in VID_EXT:
+            yield entry, rel_path
+    except OSError as e:  # Missing or unreadable directory is skipped (like os.walk does)
+      logging.warning(f"Could not list directory {dir_path}: {e}")
+
+
+# Progress bar fonts, shared by all progress bars (created on first use, Tk root must exist)
+progress_bar_fonts = {}
+
+
+#############################################################################
+def get_progress_bar_font(bold):
+  """Returns the shared (normal or bold) progress bar font."""
+  if bold not in progress_bar_fonts:
+    progress_bar_fonts[bold] = tkfont.Font(family='TkDefaultFont', size=9, weight='bold' if bold else 'normal')
+  return progress_bar_fonts[bold]
+
+
+# Parsed config files: path -> (mtime_ns, DEFAULT section values), re-parsed only when the file changes
+config_cache = {}
+
+
+#############################################################################
+def read_config_values(config_path):
+  """Returns the DEFAULT section values of a config file as a dict (None if not found), cached by file mtime."""
+  try:
+    mtime_ns = os.stat(config_path).st_mtime_ns
+  except OSError:
+    return None
+  cached = config_cache.get(config_path)
+  if cached is not None and cached[0] == mtime_ns:
+    return dict(cached[1])
+
+  config = configparser.ConfigParser(interpolation=None)  # Values are taken as is (e.g. paths with '%')
+  if not config.read(config_path):
+    return None
+  values = dict(config['DEFAULT'])
+  config_cache[config_path] = (mtime_ns, values)
+  return dict(values)
 
 
 #############################################################################
@@ -37,14 +183,26 @@ class CustomProgressBar(tk.Canvas):
   """
   def __init__(self, master, use_bold_font=False, *args, **kwargs):
     super().__init__(master, *args, **kwargs)
-    self.progress_var = tk.DoubleVar()
-    self.filename_var = tk.StringVar()
-    self.paused = tk.BooleanVar(value=False)
-    self.cancelled = tk.BooleanVar(value=False)
-    self.relative_path = None
+    # Plain attributes (not Tk variables), so that worker code can access them without Tk calls
+    self.progress = 0.0
+    self.display_text = ""  # Filename (or total progress) text
+    self.paused = False
+    self.cancelled = False
 
     # Set bald font based on parameter
-    self.text_font = ('TkDefaultFont', 9, 'bold') if use_bold_font else ('TkDefaultFont', 9)
+    self.text_font = get_progress_bar_font(use_bold_font)
+
+    # Create canvas items once; redraws only update their coordinates and options
+    self.border_item = self.create_rectangle(2, 2, 2, 2, outline="black")  # Border rectangle first
+    self.fill_item = self.create_rectangle(2, 2, 2, 2, state=tk.HIDDEN)  # Progress fill inside the border
+    self.fill_state = None  # Last drawn fill (width, height, color), to skip redundant redraws
+    self.text_item = self.create_text(
+      0, 0,
+      text="",
+      anchor="center",
+      fill="black",
+      font=self.text_font  # Bald font (optionally)
+    )
 
     # Bind configure event to handle resizing
     self.bind("<Configure>", self.draw_progress_bar)
@@ -56,51 +214,60 @@ class CustomProgressBar(tk.Canvas):
   #############################################################################
   def draw_progress_bar(self, event=None):
     """Redraws the progress bar based on current progress and filename."""
-    self.delete("all")  # Clear canvas
-
     # Get current dimensions
     width = self.winfo_width()
     height = self.winfo_height()
 
+    self.coords(self.border_item, 2, 2, width-2, height-2)
+    self.coords(self.text_item, width / 2, height / 2)  # Centered text
+    self.itemconfigure(self.text_item, text=self.display_text)
+    self.fill_state = None  # Force fill redraw
+    self.draw_fill()
+
+
+  #############################################################################
+  def draw_fill(self):
+    """Updates the progress fill rectangle (size and color) only."""
+    width = self.winfo_width()
+    height = self.winfo_height()
+
     # Calculate progress width
-    progress = self.progress_var.get()
+    progress = self.progress
     fill_width = int((width - 5) * (progress / 100))  # Adjusted for border
 
-    # Draw border rectangle first
-#    self.create_rectangle(2, 2, width-2, height-2,  outline="black", width=1)
-    self.create_rectangle(2, 2, width-2, height-2,  outline="black")
-
-    # Draw progress fill inside the border
-    if fill_width > 0:
-      fill_color = "#A8D8A8"  # Default green
-      if self.paused.get():
-        fill_color = "#F8EA90"  # Yellow for paused
-      if self.cancelled.get():
-        fill_color = "#FF9999"  # Red for cancelled
-      self.create_rectangle(2, 2, fill_width + 2, height - 2, fill=fill_color)
-
-    # Draw centered text
-    self.create_text(
-      width / 2, height / 2,
-      text=self.filename_var.get(),
-      anchor="center",
-      fill="black",
-      font=self.text_font  # Bald font (optionally)
-    )
+    fill_color = "#A8D8A8"  # Default green
+    if self.paused:
+      fill_color = "#F8EA90"  # Yellow for paused
+    if self.cancelled:
+      fill_color = "#FF9999"  # Red for cancelled
+
+    # Most progress updates don't change the fill by a whole pixel
+    fill_state = (max(0, fill_width), height, fill_color)
+    if fill_state == self.fill_state:
+      return
+    self.fill_state = fill_state
+
+    if fill_width <= 0:
+      self.itemconfigure(self.fill_item, state=tk.HIDDEN)
+      return
+    self.coords(self.fill_item, 2, 2, fill_width + 2, height - 2)
+    self.itemconfigure(self.fill_item, fill=fill_color, state=tk.NORMAL)
 
 
   #############################################################################
   def set_progress(self, value):
-    """Sets the progress value and redraws the bar."""
-    self.progress_var.set(value)
-    self.draw_progress_bar()
+    """Sets the progress value and redraws the progress fill."""
+    self.progress = value
+    self.draw_fill()
 
 
   #############################################################################
   def set_display_text(self, display_text):
-    """Sets the display text (filename) and redraws the bar."""
-    self.filename_var.set(display_text)
-    self.draw_progress_bar()
+    """Sets the display text (filename) and updates the text item, if the text has changed."""
+    if display_text == self.display_text:
+      return
+    self.display_text = display_text
+    self.itemconfigure(self.text_item, text=display_text)
 
 
 #############################################################################
@@ -120,25 +287,36 @@ class VideoProcessor:
     # Initialize GUI variables as empty
     self.ffmpeg_path = tk.StringVar()
     self.tempo = tk.DoubleVar()
+    # Set when the tempo entry changes, cleared by a successful validation (so unchanged tempo needs no Tcl calls)
+    self.tempo_changed = True
+    self.tempo.trace_add('write', self.on_tempo_write)
     self.src_dir = tk.StringVar()
     self.dst_dir = tk.StringVar()
     self.n_threads = tk.IntVar()
+    self.ffmpeg_threads = DFLT_FFMPEG_THREADS  # Advanced option, set in config file only
+    self.skip_up_to_date = bool(DFLT_SKIP_UP_TO_DATE)  # Advanced option, set in config file only
+    self.manifest = {}  # Up-to-date outputs {relative_path: [src size, src mtime_ns, output settings]}
+
+    # Logging is set up first, so that no message is logged before it (implicit basicConfig would log to stderr)
+    self.setup_logging('INFO')  # 'INFO' or 'DEBUG' for more detailed logging
 
     # Load application configuration
-    self.config = configparser.ConfigParser()
+    self.config = configparser.ConfigParser(interpolation=None)  # Values are saved as is (e.g. paths with '%')
     self.load_config()
+    self.snapshot_config()
 
     # Init variables
-    self.progress_bars = []
+    self.progress_bars = []  # Progress bars shown in the current run
     self.progress_bars_idx = []
-    self.active_threads = 0
+    self.progress_bars_pool = []  # All created progress bars (and index labels), reused between runs
+    self.progress_bars_idx_pool = []
+    self.total_progress = None  # Created on the first run
     self.total_files = 0
     self.processed_files = 0
-    self.processed_files_lock = threading.Lock()  # Lock for thread-safe access
-    self.processed_seconds_arr = {}
-    self.processed_seconds_arr_lock = threading.Lock()  # Lock for thread-safe access
+    self.total_processed_seconds = 0  # Processed time of all files, updated by per-file deltas
+    # Single lock for all counters updated while processing (files counts and total_processed_seconds)
+    self.counters_lock = threading.Lock()
     self.total_dst_seconds = 0  # Total size of all files
-    self.total_dst_seconds_lock = threading.Lock()  # Lock for thread-safe access
     self.total_dst_sz = 0
     self.total_src_sz = 0
     self.error_files = 0
@@ -147,30 +325,41 @@ class VideoProcessor:
     self.status_text = None
     self.start_time = None
     self.processing_complete = False
-    self.processed_files_set = set()
+    self.finish_requested = False  # Set by the event loop thread, when all files are finished
     self.processed_dst_files_set = set()  # Track actual destination file paths
     self.processing_complete_event = threading.Event()
     self.active_processes = {}  # Change to a dictionary {pid: process_object}
     self.processes_lock = threading.Lock()  # Add lock for thread-safe access
     self.progress_bar_to_pid = {}  # Maps progress bar to process pid
+    # Existing destination files {normalized dir: normalized file names}, each directory is listed once, on first use
+    self.existing_dst_files = {}
+    self.existing_dst_files_lock = threading.Lock()  # Lock for thread-safe access
+    self.created_dst_dirs = set()  # Destination directories already created (or checked) in this run
 
     # Create GUI elements
     self.create_widgets()
     # Initialize threading components
-    self.queue = queue.Queue()
-    self.gui_queue = queue.Queue()  # Queue for GUI updates
-    self.threads = []
+    self.files_to_process = []  # (src_file_path, relative_path) list
+    # Files are processed by coroutines in an asyncio event loop, running in its own thread (for the whole app),
+    # FFMPEG processes are awaited there, so no thread is blocked per file being processed
+    self.loop = asyncio.new_event_loop()
+    self.loop_thread = threading.Thread(target=self.loop.run_forever, name="AsyncLoop", daemon=True)
+    self.loop_thread.start()
+    self.processing_future = None  # Future of process_files() coroutine, for the current run
+    # Latest pending update per progress bar {progress_bar: [progress, display_text]}
+    self.pending_progress = {}
+    self.pending_progress_lock = threading.Lock()
 
     # Bind the save_config method to the window close event.
     self.master.protocol("WM_DELETE_WINDOW", self.on_closing)
 
-    self.setup_logging('INFO')  # 'INFO' or 'DEBUG' for more detailed logging
     logging.info("VideoProcessor initialized")
 
-    self.status_update_queue = queue.Queue()
-    self.status_update_thread = threading.Thread(target=self.process_status_updates, daemon=True) # Explicitly set daemon
-    self.status_update_thread.start()
-    logging.info("Status update thread started.")
+    # Status messages posted by worker threads, shown periodically by the GUI thread (no Tk calls from workers).
+    # deque append/popleft are atomic, so no lock is needed (many producers, single consumer)
+    self.pending_status = collections.deque()
+    # Status and progress bars are updated only from the main (GUI) thread, by a single periodic callback
+    self.master.after(GUI_UPDATE_INTERVAL, self.pump_gui_updates)
 
     # Using this flag for more gracefull shutdown, if closing application while files are still processed
     self.is_shutting_down = False
@@ -179,45 +368,85 @@ class VideoProcessor:
   #############################################################################
   def load_config(self):
     """Loads config from video_processor_config.ini or uses defaults if not found."""
-    if not self.config.read(DFLT_CONFIG_FILE):
-      logging.warning("Config file not found. Using defaults.")
-      self.config['DEFAULT'] = {
-        'ffmpeg_path': DFLT_FFMPEG_PATH,
-        'tempo': str(DFLT_TEMPO),
-        'src_dir': DFLT_SRC_DIR,
-        'dst_dir': DFLT_DST_DIR,
-        'n_threads': str(DFLT_N_THREADS),
-        'overwrite_option': DFLT_OVERWRITE_OPTION,  # Skip by default
-      }
-    else:
-      try:
-        # Set the values using the loaded configuration or defaults
-        self.ffmpeg_path.set(self.config['DEFAULT'].get('ffmpeg_path', DFLT_FFMPEG_PATH))
-        self.tempo.set(float(self.config['DEFAULT'].get('tempo', str(DFLT_TEMPO))))
-        self.src_dir.set(self.config['DEFAULT'].get('src_dir', DFLT_SRC_DIR))
-        self.dst_dir.set(self.config['DEFAULT'].get('dst_dir', DFLT_DST_DIR))
-        self.n_threads.set(int(self.config['DEFAULT'].get('n_threads', str(DFLT_N_THREADS))))
-        self.overwrite_options.set(self.config['DEFAULT'].get('overwrite_option', DFLT_OVERWRITE_OPTION))
-      except Exception as e:
-        messagebox.showerror("Config Error", f"Could not load config file: {e}")
+    # Defaults, overridden by the values from config file (read once into a plain dict)
+    self._cfg = {
+      'ffmpeg_path': DFLT_FFMPEG_PATH,
+      'tempo': str(DFLT_TEMPO),
+      'src_dir': DFLT_SRC_DIR,
+      'dst_dir': DFLT_DST_DIR,
+      'n_threads': str(DFLT_N_THREADS),
+      'ffmpeg_threads': str(DFLT_FFMPEG_THREADS),
+      'skip_up_to_date': str(DFLT_SKIP_UP_TO_DATE),
+      'overwrite_option': DFLT_OVERWRITE_OPTION,  # Skip by default
+    }
+    try:
+      values = read_config_values(DFLT_CONFIG_FILE)
+      if values is None:
+        logging.warning("Config file not found. Using defaults.")
+      else:
+        self._cfg.update(values)
+
+      # Set the values using the loaded configuration or defaults
+      cfg = self._cfg
+      self.ffmpeg_path.set(cfg['ffmpeg_path'])
+      self.tempo.set(float(cfg['tempo']))
+      self.src_dir.set(cfg['src_dir'])
+      self.dst_dir.set(cfg['dst_dir'])
+      self.n_threads.set(int(cfg['n_threads']))
+      self.ffmpeg_threads = int(cfg['ffmpeg_threads'])
+      self.skip_up_to_date = bool(int(cfg['skip_up_to_date']))
+      self.overwrite_options.set(cfg['overwrite_option'])
+    except Exception as e:
+      messagebox.showerror("Config Error", f"Could not load config file: {e}")
+
+
+  #############################################################################
+  def snapshot_config(self):
+    """Copies GUI settings into plain attributes, read by processing code (incl. worker threads) instead of Tk vars."""
+    self._src_dir = self.src_dir.get()
+    self._dst_dir = self.dst_dir.get()
+    self._ffmpeg_path = str(self.ffmpeg_path.get())
+    self._ffprobe_path = get_ffprobe_path(self._ffmpeg_path)
+    self._tempo = float(self.tempo.get())
+    self._n_threads = self.n_threads.get()
+    if self.ffmpeg_threads > 0:
+      # Fixed threads per FFMPEG process: run no more processes than the CPU cores can serve
+      max_processes = max(1, (os.cpu_count() or self._n_threads) // self.ffmpeg_threads)
+      if self._n_threads > max_processes:
+        logging.info("Processing threads limited to %d (%d FFMPEG threads per process)", max_processes, self.ffmpeg_threads)
+        self._n_threads = max_processes
+    self._overwrite_option = self.overwrite_options.get()
 
 
   #############################################################################
   def save_config(self):
     """Saves application configuration to video_processor_config.ini."""
-    if self.validate_tempo():
-      self.config['DEFAULT']['tempo'] = str(self.tempo.get())
-    else:
-      self.config['DEFAULT']['tempo'] = str(DFLT_TEMPO)
-
-    self.config['DEFAULT']['n_threads'] = str(self.n_threads.get())
-    self.config['DEFAULT']['ffmpeg_path'] = self.ffmpeg_path.get()
-    self.config['DEFAULT']['src_dir'] = self.src_dir.get()
-    self.config['DEFAULT']['dst_dir'] = self.dst_dir.get()
-    self.config['DEFAULT']['overwrite_option'] = self.overwrite_options.get()
+    self._cfg.update({  # Other (unknown) keys from the config file are kept
+      'ffmpeg_path': self.ffmpeg_path.get(),
+      'tempo': str(self.tempo.get()) if self.validate_tempo() else str(DFLT_TEMPO),
+      'src_dir': self.src_dir.get(),
+      'dst_dir': self.dst_dir.get(),
+      'n_threads': str(self.n_threads.get()),
+      'ffmpeg_threads': str(self.ffmpeg_threads),
+      'skip_up_to_date': str(int(self.skip_up_to_date)),
+      'overwrite_option': self.overwrite_options.get(),
+    })
+    # Don't rewrite the file, if nothing has changed since it was read (or written)
+    cached = config_cache.get(DFLT_CONFIG_FILE)
+    if cached is not None and cached[1] == self._cfg:
+      try:
+        if os.stat(DFLT_CONFIG_FILE).st_mtime_ns == cached[0]:
+          return
+      except OSError:  # File was removed, write it again
+        pass
     try:
+      # Other sections of the config file are kept (the file is only parsed here, when it is actually written)
+      self.config.read(DFLT_CONFIG_FILE)
+      self.config['DEFAULT'] = self._cfg  # Assigned at once
       with open(DFLT_CONFIG_FILE, 'w') as configfile:
         self.config.write(configfile)
+      # The written values are current, no need to parse the file again on the next load
+      config_cache[DFLT_CONFIG_FILE] = (os.stat(DFLT_CONFIG_FILE).st_mtime_ns, dict(self._cfg))
     except Exception as e:
       messagebox.showerror("Config Error", f"Could not save config file: {e}")
 
@@ -262,8 +491,12 @@ class VideoProcessor:
     status_frame.grid(row=7, column=0, columnspan=2, sticky='nsew', padx=5, pady=5)
 
     # Create the status_text widget
-    self.status_text = tk.Text(status_frame, height=10, width=165, wrap=tk.WORD, state=tk.DISABLED)
+    self.status_text = tk.Text(status_frame, height=10, width=165, wrap=tk.WORD)
     self.status_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    # Keep the widget NORMAL (no state toggling per message), but read-only for the user
+    self.status_text.bind("<Key>", self.block_status_text_edit)
+    for event in ("<<Paste>>", "<<PasteSelection>>", "<<Cut>>", "<<Clear>>"):
+      self.status_text.bind(event, lambda e: "break")
 
     # Create the scrollbar
     scrollbar = ttk.Scrollbar(status_frame, orient=tk.VERTICAL, command=self.status_text.yview)
@@ -296,30 +529,34 @@ class VideoProcessor:
     if not os.path.exists(ffmpeg_path):
       return False, f"FFMPEG not found at: {ffmpeg_path}\nPlease check and update the path in the config file."
 
-    ffprobe_path = os.path.join(os.path.dirname(ffmpeg_path), "ffprobe.exe")
+    ffprobe_path = get_ffprobe_path(ffmpeg_path)
     if not os.path.exists(ffprobe_path):
-      return False, f"FFPROBE not found at: {ffprobe_path}\nIt should be in the same folder as ffmpeg.exe."
+      return False, f"FFPROBE not found at: {ffprobe_path}\nIt should be in the same folder as {os.path.basename(ffmpeg_path)}."
 
     return True, ""
 
 
   #############################################################################
-  def get_metadata_info(self, ffmpeg_path, src_file_path):
-    """Gets media file metadata (Duration) using FFPROBE."""
-    try:
-      # Derive ffprobe_path from ffmpeg_path
-      ffprobe_path = os.path.join(os.path.dirname(ffmpeg_path), "ffprobe.exe")
-      if not os.path.exists(ffprobe_path):
-        logging.error(f"FFPROBE not found at: {ffprobe_path}")
-        return None, False
+  def get_metadata_info(self, ffprobe_path, src_file_path):
+    """Gets media file metadata (Duration) using mutagen (if available), falling back to FFPROBE."""
+    if mutagen is not None and os.path.splitext(src_file_path)[1].lower() in MUTAGEN_EXT:
+      try:
+        media = mutagen.File(src_file_path)
+        if media is not None and media.info.length > 0:
+          return int(media.info.length), True  # seconds
+      except Exception as e:
+        logging.debug("mutagen failed for %s, falling back to FFPROBE: %s", src_file_path, e)
 
+    try:
+      # FFPROBE path is derived (and checked) once per run, see snapshot_config/check_executables
       ffprobe_cmd = [
         ffprobe_path, '-v', 'error',
         '-show_entries', 'format=duration',
         '-of', 'json',
         src_file_path
       ]
-      rslt = subprocess.run(ffprobe_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True)
+      rslt = subprocess.run(ffprobe_cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            text=True, check=True, creationflags=POPEN_CREATIONFLAGS)
       info = json.loads(rslt.stdout)
       total_seconds = int(float(info['format']['duration']))  # seconds
 
@@ -333,63 +570,86 @@ class VideoProcessor:
     return total_seconds, True
 
 
+  #############################################################################
+  def get_existing_dst_names(self, dir_path):
+    """Returns normalized names of existing files in a destination directory, listing it on first use."""
+    dir_key = os.path.normcase(dir_path)
+    with self.existing_dst_files_lock:
+      names = self.existing_dst_files.get(dir_key)
+      if names is None:
+        try:
+          names = {os.path.normcase(name) for name in os.listdir(dir_path)}
+        except OSError:  # Directory doesn't exist (yet)
+          names = set()
+        self.existing_dst_files[dir_key] = names
+    return names
+
+
+  #############################################################################
+  def dst_file_exists(self, dst_file_path):
+    """Checks, if destination file exists, using the cached directory listing."""
+    dir_path, file_name = os.path.split(dst_file_path)
+    return os.path.normcase(file_name) in self.get_existing_dst_names(dir_path)
+
+
   #############################################################################
   def handle_overwrite(self, dst_file_path, relative_path):
-    """Handles overwrite logic based on user selection."""
+    """Handles overwrite logic based on user selection, returns the final destination file path."""
     msg = ""
-    overwrite_option = self.overwrite_options.get()
-    dst_relative_path_base, ext = os.path.splitext(relative_path)
-    dst_relative_path = dst_relative_path_base + ext
-    dst_file_path = os.path.join(self.dst_dir.get(), dst_relative_path)
-    if os.path.exists(dst_file_path):
+    overwrite_option = self._overwrite_option
+    dst_file_dir, dst_file_name = os.path.split(dst_file_path)
+    existing_names = self.get_existing_dst_names(dst_file_dir)
+    if os.path.normcase(dst_file_name) in existing_names:
       if overwrite_option == "Overwrite existing files":  # Overwrite existing
         msg = f"Overwriting: {relative_path}"
-        self.status_update_queue.put(msg)  # Use queue for status updates
+        self.post_status(msg)
         logging.debug(msg)
         return dst_file_path
       elif overwrite_option == "Rename existing files":  # Rename instead of overwriting
-        base, ext = os.path.splitext(relative_path)
+        base, ext = os.path.splitext(dst_file_name)
+        base_nc, ext_nc = os.path.normcase(base), os.path.normcase(ext)  # Normalized once, outside the loop
         i = 1
-        while os.path.exists(os.path.join(self.dst_dir.get(), f"{base}({i}){ext}")):
-          i += 1
-        dst_file_path = os.path.join(self.dst_dir.get(), f"{base}({i}){ext}")
+        with self.existing_dst_files_lock:  # Check and reserve the new name atomically
+          while (candidate := f"{base_nc}({i}){ext_nc}") in existing_names:
+            i += 1
+          existing_names.add(candidate)
+        dst_file_path = os.path.join(dst_file_dir, f"{base}({i}){ext}")
         msg = f"Renaming: {relative_path} to {os.path.basename(dst_file_path)}"
-        self.status_update_queue.put(msg)  # Use queue for status updates
+        self.post_status(msg)
         logging.debug(msg)
         return dst_file_path
       elif overwrite_option == "Skip existing files":  # Skip processing
         msg = f"Skipping: {relative_path}"
-        self.status_update_queue.put(msg)  # Use queue for status updates
+        self.post_status(msg)
         logging.debug(msg)
         return None  # Skip processing this file
     else:  # Normal output (no overwrite)
+      with self.existing_dst_files_lock:
+        existing_names.add(os.path.normcase(dst_file_name))
       msg = f"Processing: {relative_path}"
-      self.status_update_queue.put(msg)  # Use queue for status updates
+      self.post_status(msg)
       logging.debug(msg)
       return dst_file_path
 
 
   #############################################################################
-  def generate_ffmpeg_command(self, src_file_path, dst_file_path):
-    """Generates FFMPEG command for compression with optional tempo."""
-    # Convert paths to string and handle potential encoding issues
-    src_file_path = str(src_file_path)
-    base, ext = os.path.splitext(str(dst_file_path))
-    dst_file_path = base + ext
-    ext_lower = ext.lower()
-
-    # Choose audio codec based on output container
-    # WebM requires Vorbis or Opus audio; use Opus by default
-    audio_codec = "libopus" if ext_lower == ".webm" else "aac"
+  def build_video_options(self):
+    """Returns FFMPEG filter and video options (compression with optional tempo)."""
+    # Filter options
+    if self._tempo != 1.0:
+      # If tempo is not 1, we need to adjust both video and audio streams
+      # For video files we need to use tempo value for audio stream and PTS=1/tempo for video
+      PTS = 1 / self._tempo # PTS is 1/tempo
+      # Use single combined video filter (instead of ["-vf", "scale=640:360"])
+      filter_params = (
+        "-filter:v", f"setpts={PTS:.8f}*PTS,scale=640:360",
+        "-filter:a", f"atempo={self._tempo}",  # tempo audio filter
+      )
+    else:
+      filter_params = ("-vf", "scale=640:360")
 
-    # Cmd example:
-    # ffmpeg.exe -i i.mp4 -filter:v setpts=0.66666667*PTS,scale=640:360 -filter:a atempo=1.5 -vf scale=640:360 -pix_fmt yuv420p -c:v libaom-av1 -b:v 70k -crf 30 -cpu-used 8 -row-mt 1 -g 240 -aq-mode 0 -c:a aac -b:a 80k o.mp4 -y -progress pipe:1 -nostats -hide_banner -loglevel error
-    ffmpeg_command = [
-      str(self.ffmpeg_path.get()),
-      # General options
-      "-i", src_file_path,
-      # Filter options
-      "-vf", "scale=640:360",
+    return (
+      *filter_params,
       "-pix_fmt", "yuv420p",
       # Video options
       "-c:v", "libaom-av1",
@@ -399,11 +659,44 @@ class VideoProcessor:
       "-row-mt", "1",
       "-g", "240",
       "-aq-mode", "0",
-      # Audio options
-      "-c:a", audio_codec,
-      "-b:a", "80k",
-      # Output options
-      dst_file_path,
+    )
+
+
+  #############################################################################
+  def build_ffmpeg_command_template(self, n_processes):
+    """Builds the static parts of FFMPEG command once per run, for n_processes concurrent FFMPEG processes."""
+    # Limit FFMPEG own threads, so concurrent FFMPEG processes don't oversubscribe the CPU
+    ffmpeg_threads = self.ffmpeg_threads
+    if ffmpeg_threads <= 0:  # Auto
+      ffmpeg_threads = ffmpeg_threads_per_process(n_processes)
+
+    # Cmd example:
+    # ffmpeg.exe -i i.mp4 -filter:v setpts=0.66666667*PTS,scale=640:360 -filter:a atempo=1.5 -vf scale=640:360 -pix_fmt yuv420p -c:v libaom-av1 -b:v 70k -crf 30 -cpu-used 8 -row-mt 1 -g 240 -aq-mode 0 -c:a aac -b:a 80k o.mp4 -y -progress pipe:1 -nostats -hide_banner -loglevel error
+    # Command is: prefix + [src_file_path] + options[container] + [dst_file_path] + suffix
+    self._ffmpeg_prefix = (
+      self._ffmpeg_path,
+      # General options
+      "-nostdin",  # Never read (interactive commands) from stdin
+      "-threads", str(ffmpeg_threads),  # Input (decoding) threads
+      "-filter_threads", str(ffmpeg_threads),  # Filtering (scale, setpts, atempo) threads
+      "-i",
+    )
+    video_options = self._video_options
+    # Audio options: codec is chosen based on output container
+    audio_options = ("-b:a", "80k")
+    output_options = (
+      "-map_metadata", "0",  # Copy global metadata (title, tags, etc.) from the input
+      "-threads", str(ffmpeg_threads),  # Output (encoding) threads
+    )
+    # Options per output container (file extension), "" - any other container
+    self._ffmpeg_options = {
+      "": (*video_options, "-c:a", "aac", *audio_options, *output_options),
+      # WebM requires Vorbis or Opus audio; use Opus by default
+      ".webm": (*video_options, "-c:a", "libopus", *audio_options, *output_options),
+      # MP4 index (moov atom) is moved to the file start, so playback can start before the whole file is read
+      ".mp4": (*video_options, "-c:a", "aac", *audio_options, *output_options, "-movflags", "+faststart"),
+    }
+    self._ffmpeg_suffix = (
       "-y",  # Force overwrite output file
       # Progress reporting
       "-progress", "pipe:1", # Pipe progress to stdout
@@ -411,101 +704,77 @@ class VideoProcessor:
       # Logging options
       "-hide_banner",
       "-loglevel", "error",
-    ]
+    )
 
-    if self.tempo.get() != 1.0:
-      # If tempo is not 1, we need to adjust both video and audio streams
-      # For video files we need to use tempo value for audio stream and PTS=1/tempo for video
-      PTS = 1 / self.tempo.get() # PTS is 1/tempo
-      ffmpeg_tempo_params = [
-        "-filter:v", f"setpts={PTS:.8f}*PTS,scale=640:360",
-        "-filter:a", f"atempo={self.tempo.get()}",  # tempo audio filter
-      ]
-      # Replace ["-vf", "scale=640:360"], use single combined video filter
-      # Cmd example:
-      # ffmpeg.exe -i i.mp4 -filter:v setpts=0.66666667*PTS,scale=640:360 -filter:a atempo=1.5 -vf scale=640:360 -pix_fmt yuv420p -c:v libaom-av1 -b:v 70k -crf 30 -cpu-used 8 -row-mt 1 -g 240 -aq-mode 0 -c:a aac -b:a 80k o.mp4 -y -progress pipe:1 -nostats -hide_banner -loglevel error
-      ffmpeg_command[3:5] = ffmpeg_tempo_params
 
+  #############################################################################
+  def generate_ffmpeg_command(self, src_file_path, dst_file_path):
+    """Generates FFMPEG command for a file from the per-run command template."""
+    # Convert paths to string and handle potential encoding issues
+    src_file_path = str(src_file_path)
+    dst_file_path = str(dst_file_path)
+    options = self._ffmpeg_options.get(os.path.splitext(dst_file_path)[1].lower(), self._ffmpeg_options[""])
+    ffmpeg_command = [*self._ffmpeg_prefix, src_file_path, *options, dst_file_path, *self._ffmpeg_suffix]
 
-    logging.debug(f"Process File: FFMPEG command: {' '.join(ffmpeg_command)}")
+    if self.debug_logging:  # Don't join the command, unless it is logged
+      logging.debug("Process File: FFMPEG command: %s", ' '.join(ffmpeg_command))
     return ffmpeg_command
 
 
   #############################################################################
-  def monitor_progress(self, process, progress_bar, dst_time, relative_path):
+  async def monitor_progress(self, process, progress_bar, dst_time, relative_path):
     """Monitors FFMPEG progress by reading stdout and updates the progress bar."""
-    q = queue.Queue()
-
-    def read_stdout(p, q):
-      while True:
-        line = p.stdout.readline()
-        if not line:
-          break
-        q.put(line.decode('utf-8', errors='replace'))
-      q.put(None)
-
-    stdout_thread = threading.Thread(target=read_stdout, args=(process, q))
-    stdout_thread.daemon = True
-    stdout_thread.start()
-
+    # Read FFMPEG stdout asynchronously, in the event loop.
+    # Iteration waits for the next line, and stops at EOF, when FFMPEG exits or is killed.
+    last_processed_seconds = 0
     try:
-      while True:
+      async for line in process.stdout:
+#        logging.debug(f"Progress line: {line.strip()}")
+
+        # Example output
+        ########
+        # frame=5
+        # fps=0.00
+        # stream_0_0_q=0.0
+        # bitrate=  56.9kbits/s
+        # total_size=1482
+        # out_time_us=208542
+        # out_time_ms=208542
+        # out_time=00:00:00.208542
+        # dup_frames=0
+        # drop_frames=0
+        # speed=0.407x
+        # progress=continue
+        ########
+        # Plain key=value split, no regex. Most of the lines are not "out_time_ms="
+        key, _, value = line.partition(b"=")
+        if key != OUT_TIME_MS_KEY:
+          continue
+        value = value.strip()
+        if not value.isdigit():  # e.g. "out_time_ms=N/A"
+          continue
         try:
-          line = q.get(timeout=GUI_TIMEOUT)
-          if line is None:
-            break
-#          logging.debug(f"Progress line: {line.strip()}")
-
-          # Example output
-          ########
-          # frame=5
-          # fps=0.00
-          # stream_0_0_q=0.0
-          # bitrate=  56.9kbits/s
-          # total_size=1482
-          # out_time_us=208542
-          # out_time_ms=208542
-          # out_time=00:00:00.208542
-          # dup_frames=0
-          # drop_frames=0
-          # speed=0.407x
-          # progress=continue
-          ########
-          if "out_time_ms=" in line:
-            parts = line.strip().split('=')
-            if len(parts) == 2 and parts[0] == 'out_time_ms':
-              if parts[1] == 'N/A':
-                continue
-              try:
-                processed_us = int(parts[1])
-                processed_seconds = processed_us / 1_000_000.0
-
-                with self.processed_seconds_arr_lock:
-                  self.processed_seconds_arr[relative_path] = processed_seconds
-
-                progress = min(100, (processed_seconds / dst_time) * 100) if dst_time > 0 else 0
-                progress_bar.set_progress(progress)
-                self.master.update_idletasks()
-                self.update_total_progress()
-                logging.debug(f"processed_us={processed_us}, processed_seconds/dst_time = {processed_seconds:.1f}/{dst_time:.1f} = {(processed_seconds / dst_time * 100):.1f}" )
-              except (ValueError, IndexError) as e:
-                logging.warning(f"Could not parse progress line: {line.strip()} - {e}")
-
-        except queue.Empty:
-          if process.poll() is not None:
-            break
-          time.sleep(GUI_TIMEOUT)
+          processed_us = int(value)
+          processed_seconds = processed_us / 1_000_000.0
+
+          # Add only the delta to the total, so the total progress doesn't need to sum all files
+          delta = processed_seconds - last_processed_seconds
+          last_processed_seconds = processed_seconds
+          with self.counters_lock:
+            self.total_processed_seconds += delta
+
+          progress = min(100, (processed_seconds / dst_time) * 100) if dst_time > 0 else 0
+          self.post_progress(progress_bar, progress)
+          self.update_total_progress()
+          if self.debug_logging:  # Per progress line, skip the logging call entirely unless logged
+            logging.debug("processed_us=%d, processed_seconds/dst_time = %.1f/%.1f = %.1f",
+                          processed_us, processed_seconds, dst_time, progress)
+        except (ValueError, ZeroDivisionError) as e:
+          logging.warning(f"Could not parse progress line: {line.decode('utf-8', errors='replace').strip()} - {e}")
 
     except Exception as e:
       logging.exception(f"Error monitoring progress for {relative_path}: {e}")
-    finally:
-      # Check if the process was cancelled
-      if not progress_bar.cancelled.get():
-        progress_bar.set_progress(100)
-        with self.processed_files_lock:
-          self.processed_files += 1
-      self.master.update_idletasks()
-      stdout_thread.join()
+    # The file is counted by process_file, based on FFMPEG exit code
     return
 
 
@@ -515,93 +784,153 @@ class VideoProcessor:
     if self.is_shutting_down:
       return
 
-    current_time = time.time()
+    # No time-based throttling here: updates are coalesced in pending_progress, and applied by the GUI thread
+    with self.counters_lock:  # Consistent snapshot of the counters
+      total_processed_seconds = self.total_processed_seconds
+      n_finished_files = self.processed_files + self.skipped_files + self.cancelled_files
+    total_progress_percentage = int((total_processed_seconds / self.total_dst_seconds) * 100) if self.total_dst_seconds > 0 else 0
+    total_progress_percentage = min(100, total_progress_percentage)
+    if self.debug_logging:
+      logging.debug("ttl_prcssd_seconds=%d, ttl_seconds=%d, prgrss=%d",
+                    total_processed_seconds, self.total_dst_seconds, total_progress_percentage)
 
-    # Only update GUI at specified intervals >= GUI_TIMEOUT
-    if not hasattr(self, '_last_progress_update') or \
-       (current_time - self._last_progress_update) >= GUI_TIMEOUT:
-      self._last_progress_update = current_time
+    total_progress_message = f"{total_progress_percentage}%  {n_finished_files}/{self.total_files}"
 
-      # Update processed time under lock
-      with self.total_dst_seconds_lock:
-        total_processed_seconds = sum(self.processed_seconds_arr.values())
-      total_progress_percentage = int((total_processed_seconds / self.total_dst_seconds) * 100) if self.total_dst_seconds > 0 else 0
-      total_progress_percentage = min(100, total_progress_percentage)
-      logging.debug(f"ttl_prcssd_seconds={int(total_processed_seconds)}, ttl_seconds={int(self.total_dst_seconds)}, prgrss={total_progress_percentage}")
+    self.post_progress(self.total_progress, total_progress_percentage, total_progress_message)
 
-      total_progress_message = f"{total_progress_percentage}%  {self.processed_files+self.skipped_files + self.cancelled_files}/{self.total_files}"
+    # When all files processed, set progress to 100% (might be a bit smaller/larger otherwise)
+    if n_finished_files == self.total_files:
+      total_progress_message = f"100%  {n_finished_files}/{self.total_files}"
+      self.post_progress(self.total_progress, 100, total_progress_message)
+      self.finish_requested = True  # No Tk calls here, finish_processing is called by the GUI thread
 
-      # Wrap GUI updates in try-except
-      try:
-        self.total_progress.set_progress(total_progress_percentage)
-        self.total_progress.set_display_text(total_progress_message)
-      except tk.TclError:
-        logging.debug("GUI already closed, skipping progress update")
-        return
 
-      # When all files processed, set progress to 100% (might be a bit smaller/larger otherwise)
-      if self.processed_files + self.skipped_files + self.cancelled_files == self.total_files:
-        total_progress_message = f"100%  {self.processed_files+self.skipped_files+self.cancelled_files}/{self.total_files}"
-        self.total_progress.set_progress(100)
-        self.total_progress.set_display_text(total_progress_message)
+  #############################################################################
+  def post_progress(self, progress_bar, progress=None, display_text=None):
+    """Stores a progress bar update (thread-safe), applied later by the GUI thread."""
+    with self.pending_progress_lock:  # Only the latest progress/text per progress bar is kept
+      update = self.pending_progress.setdefault(progress_bar, [None, None])
+      if progress is not None:
+        update[0] = progress
+      if display_text is not None:
+        update[1] = display_text
+
+
+  #############################################################################
+  def pump_gui_updates(self):
+    """Applies pending status and progress bar updates in the GUI thread (single periodic callback for both)."""
+    if self.is_shutting_down:
+      return
+
+    # Rescheduled even if an update fails, otherwise all later GUI updates (and finishing) would stop
+    try:
+      self.flush_status()
+
+      # Progress bars: each bar is redrawn once
+      with self.pending_progress_lock:
+        updates, self.pending_progress = self.pending_progress, {}
+
+      for progress_bar, (progress, display_text) in updates.items():
         try:
-          self.master.after(100, self.finish_processing)
+          if progress is None and display_text is None:
+            progress_bar.draw_progress_bar()  # State change only (e.g. paused/cancelled reset)
+          if progress is not None:
+            progress_bar.set_progress(progress)
+          if display_text is not None:
+            progress_bar.set_display_text(display_text)
         except tk.TclError:
-          logging.debug("GUI already closed, skipping final progress update")
+          logging.debug("Progress bar already destroyed, skipping progress update")
 
+      # Finish processing, requested by the event loop thread (after the final progress updates are applied)
+      if self.finish_requested:
+        self.finish_requested = False
+        self.finish_processing()
+    except Exception as e:
+      logging.exception(f"Error applying GUI updates: {e}")
+    finally:
+      if not self.is_shutting_down:
+        self.master.after(GUI_UPDATE_INTERVAL, self.pump_gui_updates)
 
 
   #############################################################################
-  def process_file(self, src_file_path, relative_path, progress_bar):
+  async def process_file(self, src_file_path, relative_path, progress_bar):
     """Processes a single audio file, handling potential overwrites."""
 
-    if relative_path in self.processed_files_set:
-      return  # Skip if already processed
-
-    self.processed_files_set.add(relative_path)
     process = None  # Define process outside try block
     try:
-      # if dst_file_path is None:  # Skip file
-      if self.file_info[relative_path]["skipped"]:
-        progress_bar.set_display_text(relative_path)
-        progress_bar.set_progress(100)
-        return  # Do not process, if the file should be skipped
+      # Get pre-calculated file info (skipped files are not scheduled, see process_files)
+      file_data = self.file_info[relative_path]
 
-      dst_file_path = os.path.join(self.dst_dir.get(), relative_path)
-      dst_file_path = self.handle_overwrite(dst_file_path, relative_path)
-      os.makedirs(os.path.dirname(dst_file_path), exist_ok=True)
+      # Destination path is pre-calculated, it may only change here when renaming
+      dst_file_path = self.handle_overwrite(file_data["dst_path"], relative_path)
+      dst_file_dir = os.path.dirname(dst_file_path)
+      if dst_file_dir not in self.created_dst_dirs:  # makedirs stats every path component, do it once per directory
+        os.makedirs(dst_file_dir, exist_ok=True)
+        self.created_dst_dirs.add(dst_file_dir)
 
 
       # Add the actual destination file path to the set
       self.processed_dst_files_set.add(dst_file_path)
-      # Get pre-calculated file info
-      file_data = self.file_info[relative_path]
       dst_time = file_data["duration"]
 
       # Display processed filename in progress bar
-      progress_bar.set_display_text(os.path.basename(dst_file_path))
-      progress_bar.relative_path = relative_path
+      self.post_progress(progress_bar, display_text=os.path.basename(dst_file_path))
 
       # Generate ffmpeg command for video compression
       ffmpeg_command = self.generate_ffmpeg_command(src_file_path, dst_file_path)
+      # FFMPEG errors are only logged in DEBUG mode, otherwise stderr is discarded
+      capture_stderr = self.debug_logging
       # Start FFMPEG process in binary mode for each file (n_threads)
-      process = subprocess.Popen(
-        ffmpeg_command,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        # The progress is piped to stdout, so we need to make sure the stderr buffer doesn't fill up
-        # We can read it to a devnull to discard it.
-        # Note: This requires universal_newlines=False, which is the default.
-        # stderr=subprocess.DEVNULL
+      process = await asyncio.create_subprocess_exec(
+        *ffmpeg_command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,  # Progress is piped to stdout
+        stderr=subprocess.PIPE if capture_stderr else subprocess.DEVNULL,
+        creationflags=POPEN_CREATIONFLAGS,
       )
+      # Drain stderr concurrently with stdout, so a full pipe never blocks FFMPEG
+      stderr_task = asyncio.ensure_future(process.stderr.read()) if capture_stderr else None
       # Add process to active processes list
       with self.processes_lock:
         self.active_processes[process.pid] = process
         self.progress_bar_to_pid[progress_bar] = process.pid
 
       # Monitor and update each audio file processing progress
-      self.monitor_progress(process, progress_bar, dst_time, relative_path)
-      self.master.update_idletasks()
+      await self.monitor_progress(process, progress_bar, dst_time, relative_path)
+      await process.wait()
+      if stderr_task:
+        stderr = (await stderr_task).decode("utf-8", errors="replace").strip()
+        if stderr:
+          logging.debug("FFMPEG stderr for %s: %s", relative_path, stderr)
+
+      # Cancelled flag is set before the process is killed, so a cancel is not reported as a failure
+      if progress_bar.cancelled:  # Counted as cancelled by confirm_and_kill_process
+        self.processed_dst_files_set.discard(dst_file_path)
+        # Rename the partially processed file (done here, as the progress bar is reused for the next file after this)
+        if os.path.exists(dst_file_path):
+          base, ext = os.path.splitext(dst_file_path)
+          new_path = f"{base}_cancelled{ext}"
+          try:
+            os.rename(dst_file_path, new_path)
+            logging.info(f"Renamed partial file to {new_path}")
+          except OSError as e:
+            logging.error(f"Failed to rename partial file {dst_file_path}: {e}")
+      elif process.returncode == 0:
+        self.post_progress(progress_bar, 100)
+        with self.counters_lock:
+          self.processed_files += 1
+        # Renamed outputs are not recorded, up-to-date check is done for the original destination path
+        if self.skip_up_to_date and dst_file_path == file_data["dst_path"]:
+          self.manifest[relative_path] = file_data["src_state"]
+      else:
+        # Partial output is excluded from the compression ratio
+        self.processed_dst_files_set.discard(dst_file_path)
+        if not self.is_shutting_down:
+          msg = f"FFMPEG failed for {relative_path} (exit code {process.returncode})"
+          logging.error(msg)
+          self.post_status(msg)
+          with self.counters_lock:
+            self.error_files += 1
 
       # Remove process from active processes list
       with self.processes_lock:
@@ -614,8 +943,9 @@ class VideoProcessor:
     except Exception as e:
       msg = f"Error processing {relative_path}: {e}"
       logging.exception(msg)
-      self.status_update_queue.put(msg)
-      self.error_files += 1
+      self.post_status(msg)
+      with self.counters_lock:
+        self.error_files += 1
       raise
     finally:
       # Ensure process is removed from active processes even if error occurs
@@ -644,64 +974,120 @@ class VideoProcessor:
   #############################################################################
   def queue_media_files(self):
     """Find, count, queue video files, and pre-calculate output sizes."""
-    src_dir = self.src_dir.get()
+    src_dir = self._src_dir
     self.total_files = 0
     self.total_src_sz = 0
-    self.queue = queue.Queue()
+    self.files_to_process = []
     self.file_info = {}  # Dictionary to store file info
-    self.processed_files_set.clear()
     self.processed_dst_files_set.clear()  # Clear processed destination files
     self.total_dst_seconds = 0
 
-    last_update_time = time.time()
-
-    for root, _, files in os.walk(src_dir):
-      for file in files:
-        if file.lower().endswith(VID_EXT):
-          full_path = os.path.join(root, file)
-          relative_path = os.path.relpath(full_path, src_dir)
-          self.queue.put((full_path, relative_path))
-          self.total_files += 1
-          self.total_src_sz += os.path.getsize(full_path)
-
-          # Skip existing files
-          overwrite_option = self.overwrite_options.get()
-          dst_relative_path_base, ext = os.path.splitext(relative_path)
-          dst_file_path = os.path.join(self.dst_dir.get(), dst_relative_path_base + ext)
-          if os.path.exists(dst_file_path) and overwrite_option == "Skip existing files":
-            self.skipped_files += 1
-            self.file_info[relative_path] = {"duration": 0, "skipped": True}
-            self.total_src_sz -= os.path.getsize(full_path)  # Exclude skipped file size from total
+    # Existing destination files are listed lazily, per directory (instead of a stat call per file)
+    dst_dir = self._dst_dir
+    self.existing_dst_files = {}
+    self.created_dst_dirs = set()
+
+    # Durations of unchanged files are reused from the previous runs
+    metadata_cache = self.load_metadata_cache()
+    # Cache keys of this run's files: entries under the source directory, which are not among them
+    # (deleted/modified files) are dropped. Skipped files are not stat'ed, their entries are kept by path
+    used_cache_keys = set()
+    skipped_paths = set()
+    # Outputs, produced by the previous runs from unchanged files
+    self.manifest = self.load_manifest() if self.skip_up_to_date else {}
+    durations = {}  # relative_path: source duration (seconds)
+
+    # Find and queue video files first, collecting the ones which need metadata (duration)
+    files_to_probe = []
+    for entry, relative_path in iter_video_files(src_dir):
+      full_path = entry.path
+      self.files_to_process.append((full_path, relative_path))
+      self.total_files += 1
+
+      # Destination path is calculated once here (output keeps the source container)
+      dst_file_path = os.path.join(dst_dir, relative_path)
+      # One small dict per file, filled in place (src_state is set only for the files, which are stat'ed)
+      info = self.file_info[relative_path] = {"duration": 0, "skipped": False, "dst_path": dst_file_path}
+
+      # Skip existing files
+      if self._overwrite_option == "Skip existing files" and self.dst_file_exists(dst_file_path):
+        self.skipped_files += 1
+        info["skipped"] = True
+        skipped_paths.add(full_path)
+        continue  # Skipped file size is excluded from total
+
+      st = entry.stat()  # Single stat for size, cache key and up-to-date check
+      cache_key = f"{full_path}|{st.st_size}|{st.st_mtime_ns}"
+      used_cache_keys.add(cache_key)
+
+      # Skip files, whose output was produced from the same source with the same settings
+      src_state = [st.st_size, st.st_mtime_ns, self._settings_key]
+      info["src_state"] = src_state
+      if self.skip_up_to_date and self.manifest.get(relative_path) == src_state and self.dst_file_exists(dst_file_path):
+        self.skipped_files += 1
+        info["skipped"] = True
+        continue  # Skipped file size is excluded from total
+
+      self.total_src_sz += st.st_size
+      if cache_key in metadata_cache:
+        durations[relative_path] = metadata_cache[cache_key]
+      else:
+        files_to_probe.append((full_path, relative_path, cache_key))
+
+    tempo = self._tempo
+    for relative_path, duration in durations.items():  # Cached durations
+      duration_tempo = duration/tempo
+      self.file_info[relative_path]["duration"] = duration_tempo
+      self.total_dst_seconds += int(duration_tempo)
+
+    # Get files metadata in parallel: each FFPROBE call is a separate process,
+    # so worker threads just wait for it (without holding the GIL)
+    ffprobe_path = self._ffprobe_path
+    n_analyzed = self.total_files - len(files_to_probe)
+    last_update_time = time.monotonic()
+    with ThreadPoolExecutor(max_workers=self._n_threads * 2) as executor:
+      futures = {
+        executor.submit(self.get_metadata_info, ffprobe_path, full_path): (full_path, relative_path, cache_key)
+        for full_path, relative_path, cache_key in files_to_probe
+      }
+      for future in as_completed(futures):
+        full_path, relative_path, cache_key = futures[future]
+        duration, success = future.result()
+        n_analyzed += 1
+        if success:
+          metadata_cache[cache_key] = duration
+          duration_tempo = duration/tempo
+          self.file_info[relative_path]["duration"] = duration_tempo
+          dst_seconds = int(duration_tempo)
+          self.total_dst_seconds += dst_seconds
+          logging.debug("%s: dst_seconds=%d", relative_path, dst_seconds)
+        else:
+          msg = f"Could not get audio file metadata for {full_path}"
+          logging.error(msg)
+          self.post_status(msg)
+          self.error_files += 1
+          # Do not process the file
+          self.file_info[relative_path]["skipped"] = True
+
+        # Update the status_text every second, replacing text (instead of adding new lines)
+        current_time = time.monotonic()
+        if current_time - last_update_time >= UPDATE_STATUS_TIMEOUT:
+          msg = f"{n_analyzed} files analyzed, total duration: "
+          if (self.total_dst_seconds > 3600):  # > 1 Hour?
+            msg += f"{self.total_dst_seconds / (3600):.2f} Hours"
           else:
-            # Get audio file metadata and calculate size
-            duration, success = self.get_metadata_info(self.ffmpeg_path.get(), full_path)
-            if success:
-              duration_tempo = duration/self.tempo.get()
-              self.file_info[relative_path] = {"duration": duration_tempo, "skipped": False}
-              # logging.debug(f"{relative_path}: dst_est_sz_kbt={dst_est_sz_kbt}")
-              dst_seconds = int(duration_tempo)
-              self.total_dst_seconds += dst_seconds
-              logging.debug(f"{relative_path}: dst_seconds={dst_seconds}")
-            else:
-              msg = f"Could not get audio file metadata for {full_path}"
-              logging.error(msg)
-              self.status_update_queue.put(msg)
-              self.error_files += 1
-              # Ensure file_info is populated even on failure to avoid KeyError later
-              self.file_info[relative_path] = {"duration": 0, "skipped": True}
-
-          # Update the status_text every second, replacing text (instead of adding new lines)
-          current_time = time.time()
-          if current_time - last_update_time >= UPDATE_STATUS_TIMEOUT:
-            msg = f"{self.total_files} files analyzed, total duration: "
-            if (self.total_dst_seconds > 3600):  # > 1 Hour?
-              msg += f"{self.total_dst_seconds / (3600):.2f} Hours"
-            else:
-              msg += f"{self.total_dst_seconds / (60):.2f} Minutes"
-            self.update_status(msg, replace=True)
-#            logging.info(msg)
-            self.master.update_idletasks()
-            last_update_time = current_time
+            msg += f"{self.total_dst_seconds / (60):.2f} Minutes"
+          self.update_status(msg, replace=True)
+#          logging.info(msg)
+          self.master.update_idletasks()
+          last_update_time = current_time
+
+    src_dir_prefix = os.path.join(src_dir, "")  # Entries of other source directories are kept
+    used_cache = {key: duration for key, duration in metadata_cache.items()
+                  if key in used_cache_keys or not key.startswith(src_dir_prefix)
+                  or key.rsplit("|", 2)[0] in skipped_paths}
+    if files_to_probe or len(used_cache) != len(metadata_cache):  # Got new durations or dropped stale ones
+      self.save_metadata_cache(used_cache)
 
     logging.debug(f"total_dst_seconds={self.total_dst_seconds}")
     msg = f"{self.total_files} files analyzed, total duration: "
@@ -715,65 +1101,103 @@ class VideoProcessor:
 
 
   #############################################################################
-  def start_process_files_threads(self):
-    """Starts the file processing threads."""
-    num_threads = min(self.n_threads.get(), self.total_files)
-    self.active_threads = num_threads
+  def load_metadata_cache(self):
+    """Loads media files durations cache {"path|size|mtime_ns": duration} from a JSON file."""
+    try:
+      with open(DFLT_METADATA_CACHE_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+    except FileNotFoundError:
+      return {}
+    except Exception as e:
+      logging.warning(f"Could not load metadata cache {DFLT_METADATA_CACHE_FILE}: {e}")
+      return {}
 
-    for i in range(num_threads):
-      thread = threading.Thread(target=self.worker, args=(i,), name=f"Worker-{i}")
-      thread.daemon = True  # Make thread daemon so it doesn't prevent program exit
-      self.threads.append(thread)
-      thread.start()
+
+  #############################################################################
+  def save_metadata_cache(self, metadata_cache):
+    """Saves media files durations cache to a JSON file."""
+    try:
+      with open(DFLT_METADATA_CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(metadata_cache, f)
+    except Exception as e:
+      logging.warning(f"Could not save metadata cache {DFLT_METADATA_CACHE_FILE}: {e}")
 
 
   #############################################################################
-  def worker(self, thread_index):
-    """Worker function for each thread, processing files from the queue."""
-    progress_bar = self.progress_bars[thread_index]
+  def load_manifest(self):
+    """Loads up-to-date outputs manifest from a JSON file in the destination folder."""
+    manifest_path = os.path.join(self._dst_dir, DFLT_MANIFEST_FILE)
+    try:
+      with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+    except FileNotFoundError:
+      return {}
+    except Exception as e:
+      logging.warning(f"Could not load manifest {manifest_path}: {e}")
+      return {}
 
-    while not self.is_shutting_down:  # Check shutdown flag
-      try:
-        # Reduced timeout to make thread more responsive to shutdown
-        file_path, relative_path = self.queue.get(timeout=0.1)
 
-        # Reset progress bar state for the new file
-        progress_bar.cancelled.set(False)
-        progress_bar.paused.set(False)
-        progress_bar.draw_progress_bar()
+  #############################################################################
+  def save_manifest(self):
+    """Saves up-to-date outputs manifest to a JSON file in the destination folder."""
+    manifest_path = os.path.join(self._dst_dir, DFLT_MANIFEST_FILE)
+    try:
+      with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(self.manifest, f)
+    except Exception as e:
+      logging.warning(f"Could not save manifest {manifest_path}: {e}")
 
-        # Check shutdown flag immediately after getting item
-        if file_path is None or self.is_shutting_down:
-          self.queue.task_done()
-          break
 
-        self.process_file(file_path, relative_path, progress_bar)
-        self.queue.task_done()
+  #############################################################################
+  def submit_files(self):
+    """Starts processing of all found files in the event loop."""
+    self.processing_future = asyncio.run_coroutine_threadsafe(self.process_files(), self.loop)
 
-        # Check if this was the last file
-        if len(self.processed_files_set) >= self.total_files:
-          break
 
-      except queue.Empty:
-        # Check if all files are processed
-        if len(self.processed_files_set) >= self.total_files:
-          break
-        continue
-      except Exception as e:
-        if not self.is_shutting_down:
-          msg = f"Error in worker {thread_index}: {e}"
-          self.status_update_queue.put(msg)
-          logging.exception(msg)
-        self.queue.task_done()  # Ensure task is marked as done even on error
-        break
-
-    with threading.Lock():  # Use a lock to safely decrement active_threads
-      self.active_threads -= 1
-      if self.active_threads == 0 and not self.is_shutting_down:
-        try:
-          self.master.after(100, self.finish_processing)
-        except tk.TclError:
-          logging.debug("GUI already closed, skipping finish_processing call")
+  #############################################################################
+  async def process_files(self):
+    """Processes all found files, up to n_threads files concurrently, then finishes processing."""
+    # Files skipped while queueing (existing, up-to-date or without metadata) don't take a slot or a progress bar
+    files_to_process = [(src_file_path, relative_path) for src_file_path, relative_path in self.files_to_process
+                        if not self.file_info[relative_path]["skipped"]]
+    num_threads = min(self._n_threads, len(files_to_process))
+    semaphore = asyncio.Semaphore(num_threads)
+
+    # Each file being processed takes a free progress bar, and returns it when done
+    # (the semaphore guarantees there is always a free one)
+    free_progress_bars = list(reversed(self.progress_bars[:num_threads]))
+
+    results = await asyncio.gather(
+      *(self.process_file_task(semaphore, free_progress_bars, src_file_path, relative_path)
+        for src_file_path, relative_path in files_to_process),
+      return_exceptions=True,
+    )
+    if self.is_shutting_down:
+      return
+    for result in results:
+      if isinstance(result, Exception):
+        logging.error(f"Error in worker: {result}")
+
+    self.finish_requested = True  # No Tk calls here, finish_processing is called by the GUI thread
+
+
+  #############################################################################
+  async def process_file_task(self, semaphore, free_progress_bars, src_file_path, relative_path):
+    """Processes a single file, using a free progress bar."""
+    async with semaphore:
+      if self.is_shutting_down:
+        return
+
+      progress_bar = free_progress_bars.pop()
+      try:
+        # Reset progress bar state for the new file
+        progress_bar.cancelled = False
+        progress_bar.paused = False
+        self.post_progress(progress_bar)  # Redraw with the reset state
+
+        await self.process_file(src_file_path, relative_path, progress_bar)
+      finally:
+        free_progress_bars.append(progress_bar)
 
 
   #############################################################################
@@ -783,47 +1207,19 @@ class VideoProcessor:
     self.is_shutting_down = True
     self.save_config()
 
-    # Kill all FFMPEG processes first
+    # Not started files return immediately now (is_shutting_down), so no new FFMPEG processes are started.
+    # Kill all FFMPEG processes (running files then finish immediately)
     self.kill_active_processes()
 
-    # Clear the file processing queue and signal threads to stop
-    queue_items = 0
-
-    # Clear queue and signal threads in one pass
-    while not self.queue.empty():
-      try:
-        self.queue.get_nowait()
-        self.queue.task_done()
-        queue_items += 1
-      except queue.Empty:
-        break
-
-    # Add sentinel values for remaining threads
-    for _ in range(len(self.threads)):
-      self.queue.put((None, None))
-
-    # Wait for threads with shorter timeout
-    for thread in self.threads:
-      thread.join(timeout=0.01)
-      if thread.is_alive():
-        logging.warning(f"Worker thread {thread.name} failed to stop gracefully")
-
-    # Clear status update queue
-    while not self.status_update_queue.empty():
-      try:
-        self.status_update_queue.get_nowait()
-        self.status_update_queue.task_done()  # Mark task as done
-      except queue.Empty:
-        break
-
-    # Stop status update thread
-    self.status_update_queue.put(None)
-    try:
-      self.status_update_thread.join(timeout=0.2)
-      if self.status_update_thread.is_alive():
-        logging.warning("Status update thread failed to stop gracefully")
-    except Exception as e:
-      logging.error(f"Error joining status update thread: {e}")
+    # Drop remaining files and stop the event loop
+    if self.processing_future:
+      self.processing_future.cancel()
+    self.loop.call_soon_threadsafe(self.loop.stop)
+    self.loop_thread.join(timeout=1)
+    if self.loop_thread.is_alive():
+      logging.warning("Event loop thread failed to stop gracefully")
+    else:
+      self.loop.close()
 
     self.master.destroy()
     logging.info("Application shutdown complete")
@@ -841,28 +1237,30 @@ class VideoProcessor:
       messagebox.showerror("Executable Not Found", error_msg)
       return
 
-    self.status_text.config(state=tk.NORMAL)
+    # Settings are fixed for the whole run
+    self.snapshot_config()
+    # Built only here, after the tempo is validated (PTS is 1/tempo)
+    self._video_options = self.build_video_options()
+    # Output settings (independent of threads), an output is up-to-date only if produced with the same ones
+    self._settings_key = " ".join(self._video_options)
+
     self.status_text.delete(1.0, tk.END)
-    self.status_text.config(state=tk.DISABLED)
 
     self.processing_complete = False
-    self.active_threads = 0
+    self.finish_requested = False
     self.processed_files = 0
     self.skipped_files = 0
-    self.processed_files_set.clear()
-    self.processed_seconds_arr.clear()
+    self.total_processed_seconds = 0
 
-    # Remove existing progress bars, before creating new ones
+    # Hide progress bars of the previous run (widgets are kept in the pool for reuse)
     for progress_bar in self.progress_bars:
       progress_bar.grid_forget()
-      progress_bar.destroy()
-    self.progress_bars.clear()
+    self.progress_bars = []
 
-    # Remove index labels (used to index progress/threads), before creating new ones
+    # Hide index labels (used to index progress/threads)
     for label in self.progress_bars_idx:
       label.grid_forget()
-      label.destroy()
-    self.progress_bars_idx.clear()
+    self.progress_bars_idx = []
 
     # Find, count and queue for processing all audio files
     self.queue_media_files()
@@ -871,54 +1269,66 @@ class VideoProcessor:
       self.finish_processing(False)
       return
 
-    # Create progress bars dynamically
-    n_progress_bars = min(self.total_files, self.n_threads.get())
-    self.progress_bars = []
-    self.progress_bars_idx = []
-    for i in range(n_progress_bars):
+    # FFMPEG threads are shared by the actually concurrent processes (fewer files than threads leave no idle cores)
+    n_files_to_process = sum(1 for info in self.file_info.values() if not info["skipped"])
+    self.build_ffmpeg_command_template(max(1, min(self._n_threads, n_files_to_process)))
+
+    # Create only progress bars missing in the pool (none, if a previous run used as many)
+    n_progress_bars = min(self.total_files, self._n_threads)
+    for i in range(len(self.progress_bars_pool), n_progress_bars):
       # Create index label
-      idx_label = ttk.Label(self.master, text=f"{i+1}")
-      idx_label.grid(row=9+i, column=0, sticky=tk.E, padx=5)
-      self.progress_bars_idx.append(idx_label)
+      self.progress_bars_idx_pool.append(ttk.Label(self.master, text=f"{i+1}"))
 
       # Create progress bar
       progress_bar = CustomProgressBar(self.master, width=1202, height=20)
-      progress_bar.grid(row=9 + i, column=1)
       progress_bar.bind("<Button-3>", lambda event, pb=progress_bar: self.toggle_pause(pb))
       progress_bar.bind("<Double-1>", lambda event, pb=progress_bar: self.confirm_and_kill_process(pb))
-      self.progress_bars.append(progress_bar)
+      self.progress_bars_pool.append(progress_bar)
 
-    # Create overall (total) progress bar
-    ttk.Label(self.master, text="Overall progress:").grid(row=8, column=0, sticky=tk.W, padx=5)
-    self.total_progress = CustomProgressBar(self.master, use_bold_font=True, width=1202, height=25)
-    self.total_progress.grid(row=8, column=1, pady=10)  # Place it above progress bars for processed files
+    # Show progress bars (and index labels), resetting the state left from a previous run
+    self.progress_bars = self.progress_bars_pool[:n_progress_bars]
+    self.progress_bars_idx = self.progress_bars_idx_pool[:n_progress_bars]
+    for i, (idx_label, progress_bar) in enumerate(zip(self.progress_bars_idx, self.progress_bars)):
+      idx_label.grid(row=9+i, column=0, sticky=tk.E, padx=5)
+      progress_bar.grid(row=9 + i, column=1)
+      progress_bar.paused = False
+      progress_bar.cancelled = False
+      progress_bar.set_display_text("")
+
+    # Create overall (total) progress bar once
+    if self.total_progress is None:
+      ttk.Label(self.master, text="Overall progress:").grid(row=8, column=0, sticky=tk.W, padx=5)
+      self.total_progress = CustomProgressBar(self.master, use_bold_font=True, width=1202, height=25)
+      self.total_progress.grid(row=8, column=1, pady=10)  # Place it above progress bars for processed files
     self.total_progress.set_progress(0)
     self.total_progress.set_display_text("0%  0/0")
 
     self.run_button.config(state=tk.DISABLED)
     for progress_bar in self.progress_bars:
       progress_bar.set_progress(0)
-    self.total_progress.set_display_text("0%  0/0")
-    self.total_progress.set_progress(0)
 
-    self.start_time = time.time()
+    self.start_time = time.monotonic_ns()  # Monotonic, not affected by system clock adjustments
     msg = "Starting processing..."
     self.update_status(msg)
-    self.master.update_idletasks()
     logging.info(msg)
-    self.start_process_files_threads()
+    self.submit_files()
 
 
   #############################################################################
   def update_status(self, message, replace=False):
     """Updates the status text area."""
-    self.status_text.config(state=tk.NORMAL)  # Enable editing
     if replace:
       self.status_text.delete(1.0, tk.END)
     self.status_text.insert(tk.END, message + "\n")
     self.status_text.see(tk.END)
-    self.status_text.config(state=tk.DISABLED)  # Disable editing
-#    self.master.update_idletasks()
+
+
+  #############################################################################
+  def block_status_text_edit(self, event):
+    """Blocks user edits in the status text, allowing navigation and copy."""
+    if event.state & 0x4:  # Control pressed
+      return None if event.keysym in STATUS_TEXT_CTRL_KEYS else "break"
+    return None if event.keysym in STATUS_TEXT_NAV_KEYS else "break"
 
 
   #############################################################################
@@ -930,35 +1340,33 @@ class VideoProcessor:
     #
     processing_time_str = ""
     if (calc_time == True):
-      end_time = time.time()
-      processing_time = end_time - self.start_time
+      processing_time = (time.monotonic_ns() - self.start_time) / 1e9
       # Convert time in seconds to "XX min YY sec" string, e.g. 95 sec = "1 min 35 sec"
       if processing_time < 60:
-        processing_time_str += f"{processing_time:.2f} sec"
+        processing_time_str = f"{processing_time:.2f} sec"
       else:
-        processing_time_str += f"{int(processing_time/60)} min {int(processing_time%60)} sec"
+        minutes, seconds = divmod(int(processing_time), 60)
+        processing_time_str = f"{minutes} min {seconds} sec"
     else:
       processing_time = 0
 
     # Example msg: "3 Files Total: 1 processed, 1 Skipped, 1 Error. Compression ratio  3.95"
-    # Add Total and Processed files
-    msg = f"{self.total_files} Files Total: {self.processed_files} Processed"
-    # Add non-zero Skipped files
+    # Total and Processed files, then non-zero Skipped, Error and Cancelled files
+    parts = [f"{self.total_files} Files Total: {self.processed_files} Processed"]
     if self.skipped_files:
-      msg += f", {self.skipped_files} Skipped"
-    # Add non-zero Error files
+      parts.append(f"{self.skipped_files} Skipped")
     if self.error_files:
-      msg += f", {self.error_files} Errors"
-    # Add non-zero Cancelled files
+      parts.append(f"{self.error_files} Errors")
     if self.cancelled_files:
-      msg += f", {self.cancelled_files} Cancelled"
+      parts.append(f"{self.cancelled_files} Cancelled")
+    msg = ", ".join(parts)
     # Add Processing time
     if (processing_time != 0) and (self.skipped_files < self.total_files):
-      msg += f" in {processing_time_str}."
+      msg = f"{msg} in {processing_time_str}."
     # Add Compression Ratio
     self.count_dst_files_sz()
     if self.total_dst_sz:
-      msg += f" Compression ratio {(self.total_src_sz / self.total_dst_sz):.2f}."
+      msg = f"{msg} Compression ratio {(self.total_src_sz / self.total_dst_sz):.2f}."
 
     # Display message
     self.update_status("\n" + msg)
@@ -966,13 +1374,16 @@ class VideoProcessor:
     self.run_button.config(state=tk.NORMAL)
 
     # 100%
-    if hasattr(self, 'total_progress'):
+    if self.total_progress is not None:
       total_progress_message = f"100%  {self.processed_files+self.skipped_files+self.cancelled_files}/{self.total_files}"
-      self.total_progress.set_progress(100)
-      self.total_progress.set_display_text(total_progress_message)
-
-    # Clear the threads list
-    self.threads.clear()
+      # Post like the workers do, so no stale pending update overwrites the final 100%
+      self.post_progress(self.total_progress, 100, total_progress_message)
+
+    # All files are finished at this point
+    if self.skip_up_to_date:
+      self.save_manifest()
+    self.processing_future = None
+    self.flush_log()  # Complete run log on disk, without waiting for the buffer to fill
     self.master.update_idletasks()
 
 
@@ -982,36 +1393,62 @@ class VideoProcessor:
     log_file = DFLT_LOG_FILE
 
     if log_level.upper() == 'DEBUG':
-      logging.basicConfig(filename=log_file, level=logging.DEBUG,
-        format='%(asctime)s - %(levelname)s - %(message)s')
+      level, log_format = logging.DEBUG, '%(asctime)s - %(levelname)s - %(message)s'
     else:  # INFO level
-      logging.basicConfig(filename=log_file, level=logging.INFO, format='%(message)s')
+      level, log_format = logging.INFO, '%(message)s'
+
+    # Single file handler (one file handle for all the log output), written in batches instead of per record.
+    # The buffer is also flushed on errors, at the end of each run and at exit (by logging.shutdown)
+    file_handler = logging.FileHandler(log_file, mode='a', encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter(log_format))
+    self.log_handler = logging.handlers.MemoryHandler(LOG_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=file_handler)
+    # Logging threads (incl. the GUI thread) only enqueue records, a listener thread does all the file I/O.
+    # The listener is stopped at exit (before logging.shutdown), handling all the remaining records
+    log_queue = queue.SimpleQueue()
+    self.log_listener = logging.handlers.QueueListener(log_queue, self.log_handler)
+    self.log_listener.start()
+    atexit.register(self.log_listener.stop)
+    root_logger = logging.getLogger()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    root_logger.setLevel(level)
+    self.debug_logging = level <= logging.DEBUG  # Checked once, guards expensive debug messages
+
+    # Add separator and timestamp to the log file (through the logging handler, no second file handle)
+    logging.info("\n\n==================== START OF LOG - %s ====================\n", time.strftime('%Y-%m-%d %H:%M:%S'))
 
-    # Add separator and timestamp to the log file
-    with open(log_file, 'a') as f:
-      timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-      separator = f"\n\n==================== START OF LOG - {timestamp} ====================\n"
-      f.write(separator)
 
-    # Flush the log to ensure it's written
-    for handler in logging.root.handlers:
-      handler.flush()
+  #############################################################################
+  def flush_log(self):
+    """Writes all logged records to the log file (records still queued for the listener thread included)."""
+    # Stopping the listener handles all the queued records, then the buffered ones are flushed
+    self.log_listener.stop()
+    self.log_handler.flush()
+    self.log_listener.start()
 
 
   #############################################################################
   def validate_tempo(self):
     """Validates the tempo value."""
+    if not self.tempo_changed:
+      return True  # Unchanged since the last successful validation
     try:
-      tempo = float(self.tempo.get())
-      if tempo <= 0 or tempo > 2:
-        messagebox.showerror("Invalid Tempo", "Tempo must be greater than 0 and less than 2.")
+      raw_tempo = self.master.getvar(str(self.tempo))  # Raw value, without DoubleVar conversion
+      if not MIN_TEMPO < float(raw_tempo) <= MAX_TEMPO:  # Single chained bounds check
+        messagebox.showerror("Invalid Tempo", f"Tempo must be greater than {MIN_TEMPO:g} and at most {MAX_TEMPO:g}.")
         return False
+      self.tempo_changed = False
       return True
-    except ValueError:
+    except (ValueError, tk.TclError):
       messagebox.showerror("Invalid Tempo", "Please enter a valid number for tempo.")
       return False
 
 
+  #############################################################################
+  def on_tempo_write(self, *args):
+    """Marks the tempo as changed (Tk variable trace), so it is validated again."""
+    self.tempo_changed = True
+
+
   #############################################################################
   def on_tempo_focusout(self, event):
     """Handles tempo entry focus out event, validating the input."""
@@ -1020,116 +1457,102 @@ class VideoProcessor:
 
 
   #############################################################################
-  def process_status_updates(self):
-    """Processes status updates from the queue."""
-    while True:
-      try:
-        message = self.status_update_queue.get(timeout=0.1)  # Short timeout to avoid blocking indefinitely
-        if message is None: # Check for exit signal
-          break
-        self.update_status(message)
-        self.status_update_queue.task_done()
-      except queue.Empty:
-        if self.is_shutting_down:  # Check shutdown flag
-          break
-        continue
-      except Exception as e:
-        logging.exception("Error in status update thread: %s", e)
-        break
+  def post_status(self, message):
+    """Posts a status message from any thread, it is shown later by the GUI thread."""
+    self.pending_status.append(message)
+
+
+  #############################################################################
+  def flush_status(self):
+    """Shows posted status messages with a single text insert (GUI thread)."""
+    pending_status = self.pending_status
+    messages = []
+    while pending_status and len(messages) < MAX_STATUS_MESSAGES_PER_UPDATE:
+      messages.append(pending_status.popleft())
+    if messages:
+      self.update_status("\n".join(messages))
 
 
   #############################################################################
   def kill_active_processes(self):
     """Terminates all active FFMPEG processes."""
+    # Take the processes under the lock, but kill them outside of it,
+    # so that finishing workers are not blocked on the lock meanwhile
     with self.processes_lock:
-      for pid, process in self.active_processes.items():
-        try:
-          p = psutil.Process(pid)
-          if p.status() != psutil.STATUS_ZOMBIE:
-            p.kill()  # Force kill
-        except psutil.NoSuchProcess:
-          logging.warning(f"Process with PID {pid} not found, might have already finished.")
-        except Exception as e:
-          logging.error(f"Error killing process {pid}: {e}")
+      processes = list(self.active_processes.items())
       self.active_processes.clear()
 
+    for pid, process in processes:
+      try:
+        p = psutil.Process(pid)
+        if p.status() != psutil.STATUS_ZOMBIE:
+          p.kill()  # Force kill
+      except psutil.NoSuchProcess:
+        logging.warning(f"Process with PID {pid} not found, might have already finished.")
+      except Exception as e:
+        logging.error(f"Error killing process {pid}: {e}")
+
+    # Wait for the killed processes, all of them at once
+    for pid in wait_processes([pid for pid, _ in processes], 0.5):
+      logging.warning(f"Process with PID {pid} did not exit in time.")
+
 
   #############################################################################
   def confirm_and_kill_process(self, progress_bar):
     """Confirms and kills a process, then starts the next file."""
 
+    # The lock is only held for the lookups, not while the (modal) dialog is open,
+    # so that the event loop thread (starting/finishing other files) is never blocked on it
     with self.processes_lock:
       pid = self.progress_bar_to_pid.get(progress_bar)
-      if not pid:
-        return
+    if not pid:
+      return
 
-      filename = progress_bar.filename_var.get()
-      try:
-        p = psutil.Process(pid)
-        p.suspend()
-        progress_bar.paused.set(True)
+    filename = progress_bar.display_text
+    try:
+      p = psutil.Process(pid)
+      p.suspend()
+      progress_bar.paused = True
+      progress_bar.draw_progress_bar()
+      if messagebox.askyesno("Cancel Processing?", f"Are you sure you want to Cancel process for {filename}?"):
+        # Set before killing, so the file task (seeing the process exit) tells the cancel from a failure.
+        # Drawn now, as the progress bar is used for the next file, as soon as the file task finishes
+        progress_bar.cancelled = True
         progress_bar.draw_progress_bar()
-        if messagebox.askyesno("Cancel Processing?", f"Are you sure you want to Cancel process for {filename}?"):
-          try:
-            p.kill()
-            # Wait for the process to terminate to release file locks
-            p.wait(timeout=3)
-          except psutil.NoSuchProcess:
-            # Process already terminated, which is fine.
-            pass
-          except psutil.TimeoutExpired:
-            logging.warning(f"Process {pid} did not terminate within the timeout.")
-
-          progress_bar.cancelled.set(True)
-          progress_bar.draw_progress_bar()
+        try:
+          p.kill()
+          # Wait for the process to terminate to release file locks
+          p.wait(timeout=3)
+        except psutil.NoSuchProcess:
+          # Process already terminated, which is fine.
+          pass
+        except psutil.TimeoutExpired:
+          logging.warning(f"Process {pid} did not terminate within the timeout.")
+
+        with self.counters_lock:
           self.cancelled_files += 1
-          msg = f"Cancelled processing {filename}"
-          logging.info(msg)
-          self.status_update_queue.put(msg)
-
-          # Rename the partially processed file
-          if progress_bar.relative_path:
-            dst_file_path = os.path.join(self.dst_dir.get(), progress_bar.relative_path)
-            if os.path.exists(dst_file_path):
-              base, ext = os.path.splitext(dst_file_path)
-              new_path = f"{base}_cancelled{ext}"
-              try:
-                os.rename(dst_file_path, new_path)
-                logging.info(f"Renamed partial file to {new_path}")
-              except OSError as e:
-                logging.error(f"Failed to rename partial file {dst_file_path}: {e}")
-
-          # Remove the process from active tracking
-          if pid in self.active_processes:
-            del self.active_processes[pid]
-          if progress_bar in self.progress_bar_to_pid:
-            del self.progress_bar_to_pid[progress_bar]
+        msg = f"Cancelled processing {filename}"
+        logging.info(msg)
+        self.post_status(msg)
 
-          # Since a slot is now free, try to start a new task
-          self.start_new_task_if_needed()
-        else:
-          p.resume()
-          progress_bar.paused.set(False)
+        # The partially processed file is renamed by the file task (see process_file)
 
-      except psutil.NoSuchProcess:
-        logging.warning(f"Process with PID {pid} not found for cancellation.")
-      except Exception as e:
-        logging.error(f"Error killing process {pid}: {e}")
+        # Remove the process from active tracking, unless the finished file task has already done it
+        # (its progress bar may be used for the next file by now)
+        with self.processes_lock:
+          self.active_processes.pop(pid, None)
+          if self.progress_bar_to_pid.get(progress_bar) == pid:
+            del self.progress_bar_to_pid[progress_bar]
 
+        # The file task now finishes, and its progress bar is used for the next file
+      else:
+        p.resume()
+        progress_bar.paused = False
 
-  #############################################################################
-  def start_new_task_if_needed(self):
-    """Checks if a new task can be started and starts one."""
-    if not self.queue.empty() and self.active_threads < self.n_threads.get():
-      # Find a free progress bar
-      for i, pb in enumerate(self.progress_bars):
-        if pb not in self.progress_bar_to_pid:
-          thread = threading.Thread(target=self.worker, args=(i,), name=f"Worker-{i}")
-          thread.daemon = True
-          self.threads.append(thread)
-          thread.start()
-          self.active_threads += 1
-          break
+    except psutil.NoSuchProcess:
+      logging.warning(f"Process with PID {pid} not found for cancellation.")
+    except Exception as e:
+      logging.error(f"Error killing process {pid}: {e}")
 
 
   #############################################################################
@@ -1142,19 +1565,19 @@ class VideoProcessor:
 
       try:
         p = psutil.Process(pid)
-        filename = progress_bar.filename_var.get()
+        filename = progress_bar.display_text
         if p.status() == psutil.STATUS_STOPPED:
           p.resume()
-          progress_bar.paused.set(False)
+          progress_bar.paused = False
           msg = f"Resumed processing {filename}"
           logging.info(msg)
-          self.status_update_queue.put(msg)
+          self.post_status(msg)
         else:
           p.suspend()
-          progress_bar.paused.set(True)
+          progress_bar.paused = True
           msg = f"Paused processing {filename}"
           logging.info(msg)
-          self.status_update_queue.put(msg)
+          self.post_status(msg)
         progress_bar.draw_progress_bar()  # Redraw to reflect color change
       except psutil.NoSuchProcess:
         logging.warning(f"Process with PID {pid} not found for pause/resume.")
@@ -1163,7 +1586,12 @@ class VideoProcessor:
 
 
 ###############################################################################
-if __name__ == "__main__":
+def main():
+  """Creates the main window and runs the application."""
   root = tk.Tk()
   app = VideoProcessor(root)
   root.mainloop()
+
+
+if __name__ == "__main__":
+  main()